@@ -11,119 +11,278 @@ Flow:
 We do NOT store client business data; we only pass API responses through to the model.
 """
 
+import asyncio
+import functools
 import os
 import re
+import time
 from typing import AsyncGenerator
 
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
+import tiktoken
+from openai import AsyncOpenAI, OpenAI
 
-from knowledge.search import search_documents
-from integrations.client_api import call_client_api
+from knowledge.search import (
+    aembed_query,
+    asearch_documents_by_vector,
+    embed_query,
+    search_documents_by_vector,
+)
+from integrations.client_api import call_client_api, call_client_api_async
+from semantic_cache import semantic_cache
+from redis_cache import (
+    aget_cached_embedding,
+    aget_cached_response,
+    aset_cached_embedding,
+    aset_cached_response,
+    get_cached_embedding,
+    get_cached_response,
+    set_cached_embedding,
+    set_cached_response,
+)
 
 CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o")
 
+# OpenAI SSE deltas are often 1-3 chars; yielding each one through the
+# SSE encoder wastes CPU over a ~500-token answer. Coalesce into flushes
+# about one frame apart — still perceived as smooth streaming.
+STREAM_FLUSH_SECONDS = float(os.getenv("STREAM_FLUSH_SECONDS", "0.05"))
 
-def _format_docs(docs) -> str:
-    return "\n\n---\n\n".join(doc.page_content for doc in docs)
+# Intent patterns compiled once; these run on every chat turn.
+_ORDER_RE = re.compile(r"order\s*(?:#|number|id)?\s*[:\s]*(\d+)", re.I)
+_CUSTOMER_RE = re.compile(r"\b(customer|my account)\b", re.I)
 
 
-def _get_kb_context(tenant_id: str, message: str, k: int = 5) -> str:
-    """Retrieve relevant chunks from tenant's knowledge base."""
-    docs = search_documents(message, tenant_id, k=k)
+# Cap on KB context fed into the prompt; surplus tokens only add input
+# cost and TTFT.
+KB_CONTEXT_MAX_TOKENS = int(os.getenv("KB_CONTEXT_MAX_TOKENS", "2000"))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        return tiktoken.encoding_for_model(CHAT_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _format_docs(docs, max_tokens: int = KB_CONTEXT_MAX_TOKENS) -> str:
+    """
+    Join chunks up to a token budget. Docs arrive relevance-ordered from
+    retrieval, so lower-scored chunks are the ones dropped; the last chunk
+    that crosses the budget is truncated at the token boundary.
+    """
+    enc = _get_encoding()
+    parts: list[str] = []
+    remaining = max_tokens
+    for doc in docs:
+        tokens = enc.encode(doc.page_content)
+        if len(tokens) <= remaining:
+            parts.append(doc.page_content)
+            remaining -= len(tokens)
+        else:
+            if remaining > 0:
+                parts.append(enc.decode(tokens[:remaining]))
+            break
+    return "\n\n---\n\n".join(parts)
+
+
+def _get_kb_context(tenant_id: str, query_vector: list[float], k: int = 5) -> str:
+    """Retrieve relevant chunks from tenant's knowledge base by query vector."""
+    docs = search_documents_by_vector(query_vector, tenant_id, k=k)
+    return _format_docs(docs) if docs else ""
+
+
+async def _aget_kb_context(tenant_id: str, query_vector: list[float], k: int = 5) -> str:
+    """Async variant of _get_kb_context."""
+    docs = await asearch_documents_by_vector(query_vector, tenant_id, k=k)
     return _format_docs(docs) if docs else ""
 
 
+async def _aembed_with_cache(message: str) -> list[float]:
+    """Embed a query, consulting the shared Redis embedding cache first."""
+    vector = await aget_cached_embedding(message)
+    if vector is None:
+        vector = await aembed_query(message)
+        await aset_cached_embedding(message, vector)
+    return vector
+
+
+def _detect_client_endpoint(message: str) -> tuple[str, str] | None:
+    """Return (endpoint, context label) if the message asks for live data."""
+    order_match = _ORDER_RE.search(message)
+    if order_match:
+        order_id = order_match.group(1)
+        return f"/orders/{order_id}", f"Client system response for order {order_id}"
+    if _CUSTOMER_RE.search(message):
+        return "/customers/me", "Client system response"
+    return None
+
+
+def _format_client_result(result: dict, label: str) -> str:
+    if result.get("ok") and result.get("body"):
+        return f"\n\n[{label}]:\n{result['body']}\n"
+    if result.get("error"):
+        return f"\n\n[Client system unavailable: {result['error']}]\n"
+    return ""
+
+
 def _detect_and_fetch_client_data(tenant_id: str, message: str, db=None) -> str:
     """
     Detect if the message asks for live data (order, customer, etc.) and call client API.
     Returns a string to add to context (or empty). We do NOT store this data.
     """
-    message_lower = message.lower()
-    order_match = re.search(r"order\s*(?:#|number|id)?\s*[:\s]*(\d+)", message_lower, re.I)
-    if order_match:
-        order_id = order_match.group(1)
-        result = call_client_api(tenant_id, f"/orders/{order_id}", "GET", db=db)
-        if result.get("ok") and result.get("body"):
-            return f"\n\n[Client system response for order {order_id}]:\n{result['body']}\n"
-        if result.get("error"):
-            return f"\n\n[Client system unavailable: {result['error']}]\n"
-
-    if "customer" in message_lower or "my account" in message_lower:
-        result = call_client_api(tenant_id, "/customers/me", "GET", db=db)
-        if result.get("ok") and result.get("body"):
-            return f"\n\n[Client system response]:\n{result['body']}\n"
-        if result.get("error"):
-            return f"\n\n[Client system unavailable: {result['error']}]\n"
+    detected = _detect_client_endpoint(message)
+    if not detected:
+        return ""
+    endpoint, label = detected
+    return _format_client_result(call_client_api(tenant_id, endpoint, "GET", db=db), label)
+
+
+async def _adetect_and_fetch_client_data(tenant_id: str, message: str, db=None) -> str:
+    """Async variant of _detect_and_fetch_client_data."""
+    detected = _detect_client_endpoint(message)
+    if not detected:
+        return ""
+    endpoint, label = detected
+    return _format_client_result(await call_client_api_async(tenant_id, endpoint, "GET", db=db), label)
 
-    return ""
+
+# Static instructions kept byte-identical across calls and placed first in
+# the system prompt, so OpenAI's automatic prefix caching can reuse the
+# prefix across turns (lower TTFT, cheaper input tokens). Variable context
+# (KB chunks, client data) goes after this block.
+_STATIC_SYSTEM = "\n".join(
+    [
+        "You are a helpful customer support agent.",
+        "Answer ONLY based on the provided company documents and, when present, the live client system data.",
+        "Be concise and professional.",
+        'If the context does not contain enough information to answer the question, respond with exactly: "I will connect you to human support."',
+    ]
+)
 
 
 def _build_system_prompt(kb_context: str, client_context: str) -> str:
     """
-    Build system prompt from KB + optional client API context.
+    Build system prompt: static instructions first (prefix-cache friendly),
+    then KB context, then client API context at the tail.
 
     Per spec:
     - Answer ONLY based on provided company documents.
     - If not found, say you will connect to support.
     """
-    parts = [
-        "You are a helpful customer support agent.",
-        "Answer ONLY based on the provided company documents and, when present, the live client system data.",
-        "Be concise and professional.",
-    ]
+    parts = [_STATIC_SYSTEM]
     if kb_context:
         parts.append("\nCompany documents:\n" + kb_context)
     if client_context:
         parts.append("\nLive data from client system (use this to answer):\n" + client_context)
-    parts.append(
-        '\nIf the context does not contain enough information to answer the question, respond with exactly: "I will connect you to human support."'
-    )
     return "\n".join(parts)
 
 
-def _get_llm(streaming: bool = False):
-    return ChatOpenAI(
-        model=CHAT_MODEL,
-        api_key=os.getenv("OPENAI_API_KEY"),
-        temperature=0.3,
-        streaming=streaming,
-    )
+# OpenAI SDK clients, created lazily (after load_dotenv) and shared so the
+# httpx connection pool warms once. The LangChain chain wiring added
+# per-token runnable/callback overhead on the streaming hot path; for a
+# fixed 2-message prompt we call the SDK directly.
+@functools.lru_cache(maxsize=1)
+def _get_openai() -> OpenAI:
+    return OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_async_openai() -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+
+def _chat_messages(system: str, message: str) -> list[dict]:
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": message},
+    ]
 
 
 def chat(tenant_id: str, message: str, db=None) -> str:
     """
     Non-streaming chat: KB search + optional client API + OpenAI.
+    Exact repeats are served from the shared Redis cache, near-duplicates
+    from the in-process semantic cache; both skip retrieval and the
+    OpenAI call.
     """
-    kb_context = _get_kb_context(tenant_id, message)
+    cached = get_cached_response(tenant_id, message)
+    if cached is not None:
+        return cached
+    query_vector = get_cached_embedding(message)
+    if query_vector is None:
+        query_vector = embed_query(message)
+        set_cached_embedding(message, query_vector)
+    cached = semantic_cache.get(tenant_id, query_vector)
+    if cached is not None:
+        return cached
+    kb_context = _get_kb_context(tenant_id, query_vector)
     client_context = _detect_and_fetch_client_data(tenant_id, message, db=db)
     system = _build_system_prompt(kb_context, client_context)
-    llm = _get_llm(streaming=False)
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", system),
-            ("human", "{question}"),
-        ]
+    completion = _get_openai().chat.completions.create(
+        model=CHAT_MODEL,
+        messages=_chat_messages(system, message),
+        temperature=0.3,
+        extra_body={"prompt_cache_key": f"tenant:{tenant_id}"},
     )
-    chain = prompt | llm | StrOutputParser()
-    return chain.invoke({"question": message})
+    response = completion.choices[0].message.content or ""
+    if not client_context:
+        # Replies built from live client data (order status etc.) must not
+        # be replayed — neither for near-duplicates from the in-process
+        # cache nor for exact repeats from Redis, where "where is my order
+        # 1234?" would serve a stale status for the full TTL.
+        semantic_cache.put(tenant_id, query_vector, response)
+        set_cached_response(tenant_id, message, response)
+    return response
 
 
 async def chat_stream(tenant_id: str, message: str, db=None) -> AsyncGenerator[str, None]:
     """
     Streaming chat: same as chat() but yields tokens for real-time UX.
+    A semantic cache hit is yielded as a single chunk.
+
+    The query embedding and the client-API fetch are independent network
+    round-trips, so they run concurrently.
     """
-    kb_context = _get_kb_context(tenant_id, message)
-    client_context = _detect_and_fetch_client_data(tenant_id, message, db=db)
+    cached = await aget_cached_response(tenant_id, message)
+    if cached is not None:
+        yield cached
+        return
+    query_vector, client_context = await asyncio.gather(
+        _aembed_with_cache(message),
+        _adetect_and_fetch_client_data(tenant_id, message, db=db),
+    )
+    cached = semantic_cache.get(tenant_id, query_vector)
+    if cached is not None:
+        yield cached
+        return
+    kb_context = await _aget_kb_context(tenant_id, query_vector)
     system = _build_system_prompt(kb_context, client_context)
-    llm = _get_llm(streaming=True)
-    prompt = ChatPromptTemplate.from_messages(
-        [
-            ("system", system),
-            ("human", "{question}"),
-        ]
+    stream = await _get_async_openai().chat.completions.create(
+        model=CHAT_MODEL,
+        messages=_chat_messages(system, message),
+        temperature=0.3,
+        stream=True,
+        extra_body={"prompt_cache_key": f"tenant:{tenant_id}"},
     )
-    chain = prompt | llm | StrOutputParser()
-    async for chunk in chain.astream({"question": message}):
-        yield chunk
+    full_response: list[str] = []
+    buffer: list[str] = []
+    last_flush = time.monotonic()
+    async for event in stream:
+        chunk = event.choices[0].delta.content if event.choices else None
+        if chunk:
+            full_response.append(chunk)
+            buffer.append(chunk)
+            now = time.monotonic()
+            if now - last_flush >= STREAM_FLUSH_SECONDS:
+                yield "".join(buffer)
+                buffer.clear()
+                last_flush = now
+    if buffer:
+        yield "".join(buffer)
+    full = "".join(full_response)
+    if not client_context:
+        # Same rule as chat(): never cache replies that embed live
+        # client-API data, in-process or in Redis.
+        semantic_cache.put(tenant_id, query_vector, full)
+        await aset_cached_response(tenant_id, message, full)
@@ -3,24 +3,36 @@ JWT authentication and password hashing.
 Tenant-scoped: resolve tenant by API key or from JWT (user's tenant).
 """
 
+import functools
+import hashlib
+import hmac
 import os
+import time
 from datetime import datetime, timedelta
 from typing import Annotated
 
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer, APIKeyHeader
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from database import get_db
+from database import get_db, get_async_db
 from models import User, Tenant
 
 JWT_SECRET = os.getenv("JWT_SECRET", "change-me-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", "10080"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# bcrypt pinned at cost 11: ~100-150ms per hash on current hardware,
+# inside the interactive-login budget while keeping the attacker/defender
+# ratio sane. deprecated="auto" + needs_update() lets login transparently
+# rehash credentials stored at older costs.
+pwd_context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=11, deprecated="auto")
+
 bearer_scheme = HTTPBearer(auto_error=False)
 api_key_scheme = APIKeyHeader(name="X-API-Key", auto_error=False)
 
@@ -33,6 +45,11 @@ def verify_password(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+def password_needs_rehash(hashed: str) -> bool:
+    """True if the stored hash predates the current scheme/cost settings."""
+    return pwd_context.needs_update(hashed)
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MINUTES)
@@ -40,53 +57,152 @@ def create_access_token(data: dict) -> str:
     return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 
-def decode_token(token: str) -> dict | None:
+@functools.lru_cache(maxsize=4096)
+def _decode_token_cached(token: str) -> dict | None:
+    """
+    Signature verification + JSON parse, memoized: the same token arrives on
+    every request in a burst, and each hit replaces HMAC + parse work with a
+    dict lookup. Expiry is re-checked by the caller on every use.
+    """
     try:
         return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
     except JWTError:
         return None
 
 
+def decode_token(token: str) -> dict | None:
+    payload = _decode_token_cached(token)
+    if payload is None:
+        return None
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        return None
+    return payload
+
+
 def get_user_by_id(db: Session, user_id: str) -> User | None:
     return db.query(User).filter(User.id == user_id).first()
 
 
+async def aget_user_by_id(db: AsyncSession, user_id: str) -> User | None:
+    """Async user lookup; tenant is eager-loaded (no lazy IO under asyncio)."""
+    result = await db.execute(
+        select(User).options(selectinload(User.tenant)).where(User.id == user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def hash_api_key(api_key: str) -> str:
+    """SHA-256 hex digest of an API key, as stored in tenants.api_key_sha256."""
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+# digest -> tenant_id, so repeat X-API-Key auth (chat, WhatsApp bursts)
+# resolves via a primary-key fetch instead of a secondary-index scan.
+# TTL-bounded so rotated keys also age out on other workers.
+_API_KEY_ID_CACHE: TTLCache = TTLCache(maxsize=5000, ttl=300)
+
+
+def invalidate_api_key(api_key: str) -> None:
+    """Drop a cached key -> tenant mapping (call on key rotation)."""
+    _API_KEY_ID_CACHE.pop(hash_api_key(api_key), None)
+
+
+def _tenant_key_matches(tenant: Tenant, digest: str) -> bool:
+    """
+    Constant-time check that a cache-resolved tenant still owns the
+    presented key. Comparing digests via hmac.compare_digest leaks no
+    prefix timing, and catches cached mappings that a key rotation on
+    another worker has made stale.
+    """
+    stored = tenant.api_key_sha256 or hash_api_key(tenant.api_key or "")
+    return hmac.compare_digest(stored, digest)
+
+
 def get_tenant_by_api_key(db: Session, api_key: str) -> Tenant | None:
-    """Resolve tenant by API key (for chat / webhook)."""
-    return db.query(Tenant).filter(Tenant.api_key == api_key).first()
+    """Resolve tenant by API key (for chat / webhook) via its SHA-256 digest."""
+    digest = hash_api_key(api_key)
+    tenant_id = _API_KEY_ID_CACHE.get(digest)
+    if tenant_id:
+        tenant = db.get(Tenant, tenant_id)
+        if tenant and _tenant_key_matches(tenant, digest):
+            return tenant
+        _API_KEY_ID_CACHE.pop(digest, None)
+    # api_key_sha256 is backfilled at startup (database._migrate_schema),
+    # so the digest lookup covers tenants created before the column existed.
+    tenant = db.query(Tenant).filter(Tenant.api_key_sha256 == digest).first()
+    if tenant:
+        _API_KEY_ID_CACHE[digest] = tenant.id
+    return tenant
+
+
+async def aget_tenant_by_api_key(db: AsyncSession, api_key: str) -> Tenant | None:
+    """Async variant of get_tenant_by_api_key."""
+    digest = hash_api_key(api_key)
+    tenant_id = _API_KEY_ID_CACHE.get(digest)
+    if tenant_id:
+        tenant = await db.get(Tenant, tenant_id)
+        if tenant and _tenant_key_matches(tenant, digest):
+            return tenant
+        _API_KEY_ID_CACHE.pop(digest, None)
+    # Digest lookup only; startup backfill guarantees the column is populated.
+    result = await db.execute(select(Tenant).where(Tenant.api_key_sha256 == digest))
+    tenant = result.scalar_one_or_none()
+    if tenant:
+        _API_KEY_ID_CACHE[digest] = tenant.id
+    return tenant
+
+
+# token digest -> (user_id, tenant_id). Signature checks are memoized
+# above; this removes the per-request user SELECT as well. Keyed by
+# SHA-256 of the token so the cache never holds raw credentials, and
+# short-lived so revoked users fall out within the TTL. Expiry itself is
+# still enforced by decode_token on every request.
+_TOKEN_IDS_CACHE: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
-def get_current_user_from_token(
+async def get_current_user_from_token(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> User:
     if not credentials:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
     payload = decode_token(credentials.credentials)
     if not payload or "sub" not in payload:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
-    user = get_user_by_id(db, payload["sub"])
+    user = await aget_user_by_id(db, payload["sub"])
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    _TOKEN_IDS_CACHE[_token_digest(credentials.credentials)] = (user.id, user.tenant_id)
     return user
 
 
-def get_tenant_for_request(
+async def get_tenant_for_request(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(bearer_scheme)],
     api_key_header: Annotated[str | None, Depends(api_key_scheme)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Tenant:
     """Resolve tenant from X-API-Key or JWT (user's tenant)."""
     if api_key_header:
-        tenant = get_tenant_by_api_key(db, api_key_header.strip())
+        tenant = await aget_tenant_by_api_key(db, api_key_header.strip())
         if tenant:
             return tenant
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
     if credentials:
         payload = decode_token(credentials.credentials)
         if payload and "sub" in payload:
-            user = get_user_by_id(db, payload["sub"])
+            cached = _TOKEN_IDS_CACHE.get(_token_digest(credentials.credentials))
+            if cached:
+                tenant = await db.get(Tenant, cached[1])
+                if tenant:
+                    return tenant
+            user = await aget_user_by_id(db, payload["sub"])
             if user:
+                _TOKEN_IDS_CACHE[_token_digest(credentials.credentials)] = (user.id, user.tenant_id)
                 return user.tenant
     raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Provide Bearer token or X-API-Key", headers={"WWW-Authenticate": "Bearer"})
 
@@ -0,0 +1,105 @@
+"""
+Batched chat-log writer.
+
+Per-message `db.add(log); db.commit()` holds a pooled connection and
+syncs WAL once per chat turn — after LLM latency, the biggest cost on
+the chat path. Routes enqueue log rows here instead; a background task
+drains the queue and writes them as one multi-row INSERT every
+_FLUSH_MAX_ROWS rows or _FLUSH_SECONDS, whichever comes first. The
+trade-off is a bounded data-loss window on hard crash (one flush
+interval of logs), which is acceptable for analytics data.
+"""
+
+import asyncio
+
+from sqlalchemy import insert
+
+from database import AsyncSessionLocal
+from models import ChatLog
+
+_FLUSH_MAX_ROWS = 200
+_FLUSH_SECONDS = 0.5
+
+_queue: asyncio.Queue | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_task: asyncio.Task | None = None
+
+
+async def enqueue(tenant_id: str, message: str, response: str) -> None:
+    """Queue a chat log row for the background writer (async callers)."""
+    if _queue is None:
+        # Writer not running (tests, scripts): fall back to a direct write.
+        await _write_rows([_row(tenant_id, message, response)])
+        return
+    await _queue.put(_row(tenant_id, message, response))
+
+
+def enqueue_nowait(tenant_id: str, message: str, response: str) -> None:
+    """Thread-safe enqueue for sync endpoints running in the threadpool."""
+    if _queue is None or _loop is None:
+        from database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            db.add(ChatLog(tenant_id=tenant_id, message=message, response=response))
+            db.commit()
+        finally:
+            db.close()
+        return
+    _loop.call_soon_threadsafe(_queue.put_nowait, _row(tenant_id, message, response))
+
+
+def _row(tenant_id: str, message: str, response: str) -> dict:
+    return {"tenant_id": tenant_id, "message": message, "response": response}
+
+
+async def _write_rows(rows: list[dict]) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(ChatLog), rows)
+        await db.commit()
+
+
+async def _writer_loop() -> None:
+    while True:
+        rows = [await _queue.get()]
+        # Opportunistically batch whatever arrives within the flush window.
+        try:
+            while len(rows) < _FLUSH_MAX_ROWS:
+                rows.append(await asyncio.wait_for(_queue.get(), timeout=_FLUSH_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+        try:
+            await _write_rows(rows)
+        except Exception:
+            # Logs are best-effort; never let a failed flush kill the writer.
+            pass
+
+
+def start() -> None:
+    """Start the background writer. Call from app startup."""
+    global _queue, _loop, _task
+    _loop = asyncio.get_running_loop()
+    _queue = asyncio.Queue(maxsize=10 * _FLUSH_MAX_ROWS)
+    _task = _loop.create_task(_writer_loop())
+
+
+async def stop() -> None:
+    """Flush pending rows and stop the writer. Call from app shutdown."""
+    global _queue, _loop, _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    if _queue is not None and not _queue.empty():
+        rows = []
+        while not _queue.empty():
+            rows.append(_queue.get_nowait())
+        try:
+            await _write_rows(rows)
+        except Exception:
+            pass
+    _queue = None
+    _loop = None
+    _task = None
@@ -1,51 +1,170 @@
 """
-Vector store (Chroma) and document ingestion — multi-tenant.
-Each tenant has its own Chroma collection. We store only embeddings here; metadata (file_path) in knowledge_documents.
+Vector store (USearch HNSW) and document ingestion — multi-tenant.
+Each tenant has its own mmap-persisted index under USEARCH_DIR plus a
+pickled payload sidecar (key -> chunk text + metadata). Only embeddings
+and chunk payloads live here; file metadata stays in knowledge_documents.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
+import pickle
 from pathlib import Path
 
+import numpy as np
 from langchain_openai import OpenAIEmbeddings
-from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from usearch.index import Index, MetricKind, ScalarKind
+
+from knowledge.ingest import RustTextSplitter
 
 # Legacy helper module for vector store access.
 # New code should prefer backend/knowledge/ingest.py and search.py.
 
-PERSIST_DIR = os.getenv("CHROMA_PERSIST_DIR", "./data/vector_db")
+USEARCH_DIR = os.getenv("USEARCH_DIR", "./data/usearch")
+
+# Stored vector precision. Cosine similarity on normalized embeddings
+# tolerates 8-bit quantization with <1% recall loss, and i8 cuts memory
+# bandwidth 4x vs f32 (f16: 2x). USearch quantizes on insert; queries
+# stay f32.
+_QUANTIZATION = {
+    "i8": ScalarKind.I8,
+    "f16": ScalarKind.F16,
+    "f32": ScalarKind.F32,
+}[os.getenv("USEARCH_QUANTIZATION", "i8").lower()]
+
+# Index objects are cached per tenant; loading is mmap-based so the first
+# open is cheap and reopens are ~free.
+_INDEXES: dict[str, Index] = {}
+_PAYLOADS: dict[str, dict[int, tuple[str, dict]]] = {}
+
+# For tenants under this many chunks, a single BLAS matvec over a
+# C-contiguous L2-normalized f32 matrix beats graph traversal (~2-5ms at
+# 50k rows) and is exact; larger tenants fall back to the HNSW index.
+_BRUTE_FORCE_MAX_CHUNKS = int(os.getenv("BRUTE_FORCE_MAX_CHUNKS", "50000"))
 
+# tenant_id -> (N, 1536) float32 matrix, row i = vector for payload key i.
+_MATRICES: dict[str, np.ndarray] = {}
 
+# tenant_id -> content hashes of stored chunks, for ingest-time dedupe.
+_HASHES: dict[str, set[str]] = {}
+
+
+@functools.lru_cache(maxsize=1)
 def get_embeddings():
+    from http_clients import get_async_httpx_client, get_sync_httpx_client
+
     return OpenAIEmbeddings(
         model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
         api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_sync_httpx_client(),
+        http_async_client=get_async_httpx_client(),
     )
 
 
-def _collection_name(tenant_id: str) -> str:
-    return f"tenant_{tenant_id.replace('-', '_')}"
+def _index_path(tenant_id: str) -> Path:
+    return Path(USEARCH_DIR) / f"{tenant_id}.usearch"
+
 
+def _payload_path(tenant_id: str) -> Path:
+    return Path(USEARCH_DIR) / f"{tenant_id}.payload.pkl"
 
-def get_vector_store(tenant_id: str):
-    """Get or create Chroma vector store for this tenant."""
-    persist_path = Path(PERSIST_DIR)
-    persist_path.mkdir(parents=True, exist_ok=True)
-    return Chroma(
-        collection_name=_collection_name(tenant_id),
-        embedding_function=get_embeddings(),
-        persist_directory=str(persist_path.absolute()),
+
+def get_usearch_index(tenant_id: str) -> Index:
+    """Get or create (and cache) the USearch HNSW index for this tenant."""
+    index = _INDEXES.get(tenant_id)
+    if index is not None:
+        return index
+    Path(USEARCH_DIR).mkdir(parents=True, exist_ok=True)
+    index = Index(
+        ndim=1536,
+        metric=MetricKind.Cos,
+        dtype=_QUANTIZATION,
+        connectivity=16,
+        expansion_add=64,
+        expansion_search=64,
     )
+    path = _index_path(tenant_id)
+    if path.exists():
+        index.load(str(path))
+    _INDEXES[tenant_id] = index
+    return index
+
+
+def _get_payloads(tenant_id: str) -> dict[int, tuple[str, dict]]:
+    """Load (and cache) the payload sidecar mapping key -> (text, metadata)."""
+    payloads = _PAYLOADS.get(tenant_id)
+    if payloads is not None:
+        return payloads
+    path = _payload_path(tenant_id)
+    if path.exists():
+        with path.open("rb") as f:
+            payloads = pickle.load(f)
+    else:
+        payloads = {}
+    _PAYLOADS[tenant_id] = payloads
+    return payloads
+
+
+def _matrix_path(tenant_id: str) -> Path:
+    return Path(USEARCH_DIR) / f"{tenant_id}.vectors.npy"
+
+
+def _get_matrix(tenant_id: str) -> np.ndarray:
+    """Load (and cache) the tenant's normalized embedding matrix."""
+    matrix = _MATRICES.get(tenant_id)
+    if matrix is None:
+        path = _matrix_path(tenant_id)
+        matrix = np.load(path) if path.exists() else np.empty((0, 1536), dtype=np.float32)
+        _MATRICES[tenant_id] = matrix
+    return matrix
 
 
+def _content_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def _get_hashes(tenant_id: str) -> set[str]:
+    """Content hashes of the tenant's stored chunks (derived from payloads)."""
+    hashes = _HASHES.get(tenant_id)
+    if hashes is None:
+        hashes = {_content_hash(text) for text, _ in _get_payloads(tenant_id).values()}
+        _HASHES[tenant_id] = hashes
+    return hashes
+
+
+def _dedupe_chunks(tenant_id: str, chunks: list[Document]) -> list[Document]:
+    """
+    Drop chunks already stored for this tenant (by content hash).
+    Embedding dominates ingest cost; re-uploading an edited document only
+    pays for the chunks that actually changed.
+    """
+    stored = _get_hashes(tenant_id)
+    seen: set[str] = set()
+    new_chunks = []
+    for chunk in chunks:
+        h = _content_hash(chunk.page_content)
+        if h in stored or h in seen:
+            continue
+        seen.add(h)
+        new_chunks.append(chunk)
+    return new_chunks
+
+
+def _save_tenant(tenant_id: str) -> None:
+    """Persist index, payload sidecar, and embedding matrix after a write."""
+    Path(USEARCH_DIR).mkdir(parents=True, exist_ok=True)
+    _INDEXES[tenant_id].save(str(_index_path(tenant_id)))
+    with _payload_path(tenant_id).open("wb") as f:
+        pickle.dump(_PAYLOADS[tenant_id], f)
+    np.save(_matrix_path(tenant_id), _MATRICES[tenant_id])
+
+
+@functools.lru_cache(maxsize=8)
 def get_text_splitter(chunk_size: int = 1000, chunk_overlap: int = 200):
-    return RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""],
-    )
+    # Splitters are stateless after construction; reuse per configuration.
+    return RustTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
 
 def load_documents_from_texts(texts: list[str], metadatas: list[dict] | None = None) -> list[Document]:
@@ -58,16 +177,161 @@ def load_documents_from_texts(texts: list[str], metadatas: list[dict] | None = N
 
 def add_documents_to_kb(tenant_id: str, texts: list[str], file_path: str | None = None, metadatas: list[dict] | None = None) -> int:
     """
-    Add documents to tenant's knowledge base (Chroma only). Optionally record file_path in knowledge_documents (caller can do that).
+    Add documents to tenant's knowledge base (USearch index + payload sidecar).
+    Optionally record file_path in knowledge_documents (caller can do that).
     Returns number of chunks added.
     """
     if not texts:
         return 0
-    vector_store = get_vector_store(tenant_id)
     splitter = get_text_splitter()
     docs = load_documents_from_texts(texts, metadatas)
-    chunks = splitter.split_documents(docs)
+    chunks = _dedupe_chunks(tenant_id, splitter.split_documents(docs))
+    if not chunks:
+        return 0
+    vectors = get_embeddings().embed_documents([c.page_content for c in chunks])
+    _insert_chunks(tenant_id, chunks, vectors)
+    return len(chunks)
+
+
+# Embedding batches sent concurrently per ingest. 512 inputs is OpenAI's
+# per-request cap; ~5 in flight keeps throughput high without tripping
+# rate limits. Batches are packed to ~8000 tokens of similar-length
+# chunks: billing is per token but the round-trip is per request, and
+# length-homogeneous batches avoid stalling on one long outlier.
+_EMBED_BATCH_SIZE = 512
+_EMBED_BATCH_TOKENS = 8000
+_EMBED_CONCURRENCY = 5
+
+
+@functools.lru_cache(maxsize=1)
+def _embedding_encoding():
+    import tiktoken
+
+    # cl100k_base matches the text-embedding-3 family.
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _token_batches(contents: list[str]) -> list[list[int]]:
+    """
+    Group content indices into embedding batches: sorted by length so each
+    batch holds similar-sized inputs, capped at _EMBED_BATCH_TOKENS tokens
+    and _EMBED_BATCH_SIZE items. Callers restore original order by index.
+    """
+    enc = _embedding_encoding()
+    counts = [len(t) for t in enc.encode_ordinary_batch(contents)]
+    order = sorted(range(len(contents)), key=counts.__getitem__, reverse=True)
+    batches: list[list[int]] = []
+    current: list[int] = []
+    current_tokens = 0
+    for i in order:
+        if current and (
+            current_tokens + counts[i] > _EMBED_BATCH_TOKENS or len(current) >= _EMBED_BATCH_SIZE
+        ):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(i)
+        current_tokens += counts[i]
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _insert_chunks(tenant_id: str, chunks: list[Document], vectors: list[list[float]]) -> None:
+    """Bulk-insert embedded chunks into the tenant index + payload sidecar."""
+    index = get_usearch_index(tenant_id)
+    payloads = _get_payloads(tenant_id)
+    next_key = max(payloads, default=-1) + 1
+    keys = np.arange(next_key, next_key + len(chunks))
+    new_vecs = np.asarray(vectors, dtype=np.float32)
+    index.add(keys, new_vecs)
+    normalized = new_vecs / np.linalg.norm(new_vecs, axis=1, keepdims=True)
+    _MATRICES[tenant_id] = np.ascontiguousarray(np.vstack([_get_matrix(tenant_id), normalized]))
+    hashes = _get_hashes(tenant_id)
+    for key, chunk in zip(keys, chunks):
+        payloads[int(key)] = (chunk.page_content, chunk.metadata)
+        hashes.add(_content_hash(chunk.page_content))
+    _save_tenant(tenant_id)
+
+
+async def add_documents_to_kb_async(tenant_id: str, texts: list[str], file_path: str | None = None, metadatas: list[dict] | None = None) -> int:
+    """
+    Async variant of add_documents_to_kb: embedding batches are fanned out
+    with asyncio.gather instead of serial HTTP round-trips, then inserted
+    into the index in one pass. Returns number of chunks added.
+    """
+    if not texts:
+        return 0
+    splitter = get_text_splitter()
+    docs = load_documents_from_texts(texts, metadatas)
+    chunks = _dedupe_chunks(tenant_id, splitter.split_documents(docs))
     if not chunks:
         return 0
-    vector_store.add_documents(chunks)
+    contents = [c.page_content for c in chunks]
+    batches = _token_batches(contents)
+    embeddings = get_embeddings()
+    semaphore = asyncio.Semaphore(_EMBED_CONCURRENCY)
+
+    async def embed_batch(indices: list[int]) -> tuple[list[int], list[list[float]]]:
+        async with semaphore:
+            return indices, await embeddings.aembed_documents([contents[i] for i in indices])
+
+    results = await asyncio.gather(*[embed_batch(b) for b in batches])
+    # Restore original chunk order so vectors line up with payload keys.
+    vectors: list[list[float]] = [None] * len(contents)  # type: ignore[list-item]
+    for indices, vecs in results:
+        for i, vec in zip(indices, vecs):
+            vectors[i] = vec
+    _insert_chunks(tenant_id, chunks, vectors)
     return len(chunks)
+
+
+def topk(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first. argpartition + a sort of
+    just the k winners is O(N + k log k) versus O(N log N) for a full
+    argsort. Reusable by any scoring stage (brute-force scan, rerankers).
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx])]
+
+
+def retrieve_tenant(tenant_id: str, query_vector: list[float], k: int = 5) -> list[Document]:
+    """
+    Search the tenant's vectors with a precomputed query embedding.
+    Small tenants get an exact brute-force scan (one BLAS matvec over the
+    SoA matrix); large tenants use the HNSW index. Returns top-k chunks
+    hydrated from the payload sidecar.
+    """
+    payloads = _get_payloads(tenant_id)
+    matrix = _get_matrix(tenant_id)
+    n = matrix.shape[0]
+    if n == 0:
+        return []
+    q = np.asarray(query_vector, dtype=np.float32)
+    q /= np.linalg.norm(q) or 1.0
+    if n <= _BRUTE_FORCE_MAX_CHUNKS:
+        scores = matrix @ q
+        keys = topk(scores, k)
+    else:
+        # Over-fetch from the quantized (i8/f16) HNSW index, then re-rank
+        # the candidates with exact f32 dot products against the cached
+        # matrix — recovers the ~1% recall the quantization costs for the
+        # price of a few dozen extra dot products.
+        matches = get_usearch_index(tenant_id).search(q, k * 4)
+        candidates = np.array([int(m.key) for m in matches], dtype=np.intp)
+        candidates = candidates[candidates < n]
+        if len(candidates):
+            scores = matrix[candidates] @ q
+            keys = candidates[topk(scores, k)]
+        else:
+            keys = candidates
+    docs = []
+    for key in keys:
+        payload = payloads.get(int(key))
+        if payload:
+            docs.append(Document(page_content=payload[0], metadata=payload[1]))
+    return docs
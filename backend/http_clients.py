@@ -0,0 +1,24 @@
+"""
+Process-wide httpx clients for OpenAI SDK traffic.
+
+Each OpenAIEmbeddings instance otherwise builds its own httpx client and
+pays TCP+TLS setup per instance. Sharing one keep-alive client (HTTP/2,
+so embedding requests multiplex over a single connection to
+api.openai.com) makes connection setup a once-per-process cost.
+"""
+
+import functools
+
+import httpx
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=32)
+
+
+@functools.lru_cache(maxsize=1)
+def get_sync_httpx_client() -> httpx.Client:
+    return httpx.Client(http2=True, limits=_LIMITS, timeout=30.0)
+
+
+@functools.lru_cache(maxsize=1)
+def get_async_httpx_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(http2=True, limits=_LIMITS, timeout=30.0)
@@ -6,12 +6,39 @@ When the customer asks (e.g. "Where is my order 1234?"), we call the client's AP
 and pass the result to the AI. No orders/customers/invoices are stored in our DB.
 """
 
+import asyncio
+
+import httpx
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Any, Optional
+
+from cachetools import TTLCache
 from sqlalchemy.orm import Session
 
 from models import Integration
 
+# Shared session: keep-alive sockets skip the per-call TCP+TLS handshake
+# (~300ms on TLS endpoints); transient upstream errors get bounded retries.
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 502, 503, 504]),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+
+# Async client for the agent's hot path; lets callers gather() calls to
+# several client systems and pay only the slowest backend's latency.
+_ASYNC_CLIENT = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+    timeout=30.0,
+)
+
 
 def get_tenant_integration(db: Session, tenant_id: str, integration_type: Optional[str] = None) -> Optional[Integration]:
     """
@@ -24,15 +51,40 @@ def get_tenant_integration(db: Session, tenant_id: str, integration_type: Option
     return q.first()
 
 
-def _build_headers(integration: Integration) -> dict:
+# Integration configs change rarely; a short-TTL cache of the three
+# fields we need removes the per-tool-call SELECT for the rest of a
+# conversation. Values are plain tuples, not ORM rows, so nothing here
+# outlives its session. False (vs None) marks a cached "no integration".
+_INTEGRATION_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+
+def _get_integration_config(
+    db: Session, tenant_id: str, integration_type: Optional[str]
+) -> Optional[tuple[str, Optional[str], Optional[str]]]:
+    """Return cached (base_url, api_key, auth_type) for the tenant, or None."""
+    key = (tenant_id, integration_type)
+    cached = _INTEGRATION_CACHE.get(key)
+    if cached is not None:
+        return cached or None
+    integration = get_tenant_integration(db, tenant_id, integration_type)
+    config = (
+        (integration.base_url, integration.api_key, integration.auth_type)
+        if integration
+        else False
+    )
+    _INTEGRATION_CACHE[key] = config
+    return config or None
+
+
+def _build_headers(api_key: Optional[str], auth_type: Optional[str]) -> dict:
     """Build request headers from integration config (API key / Bearer)."""
     headers = {"Content-Type": "application/json", "Accept": "application/json"}
-    auth_type = (integration.auth_type or "api_key").lower()
-    if integration.api_key:
+    auth_type = (auth_type or "api_key").lower()
+    if api_key:
         if auth_type == "bearer":
-            headers["Authorization"] = f"Bearer {integration.api_key}"
+            headers["Authorization"] = f"Bearer {api_key}"
         else:
-            headers["X-API-Key"] = integration.api_key
+            headers["X-API-Key"] = api_key
     return headers
 
 
@@ -60,7 +112,8 @@ def call_client_api(
     :param params: Query params.
     :param body: JSON body for POST/PUT.
     :param integration_type: Optional filter ("orders", "crm", "custom_api").
-    :param db: DB session (if None, a temporary one is used).
+    :param db: DB session (if None, a temporary one is opened; the
+        integration-config TTL cache keeps that off the steady-state path).
     """
     if db is None:
         from database import SessionLocal
@@ -81,29 +134,30 @@ def _call_impl(
     body: Optional[dict],
     integration_type: Optional[str],
 ) -> dict[str, Any]:
-    integration = get_tenant_integration(db, tenant_id, integration_type)
-    if not integration:
+    config = _get_integration_config(db, tenant_id, integration_type)
+    if not config:
         return {"ok": False, "error": "No integration configured", "status_code": None, "body": None}
+    base_url, api_key, auth_type = config
 
-    base = integration.base_url.rstrip("/")
+    base = base_url.rstrip("/")
     path = endpoint if endpoint.startswith("/") else f"/{endpoint}"
     url = f"{base}{path}"
-    headers = _build_headers(integration)
+    headers = _build_headers(api_key, auth_type)
 
     try:
-        if method.upper() == "GET":
-            r = requests.get(url, headers=headers, params=params, timeout=30)
-        elif method.upper() == "POST":
-            r = requests.post(url, headers=headers, params=params, json=body, timeout=30)
-        elif method.upper() == "PUT":
-            r = requests.put(url, headers=headers, params=params, json=body, timeout=30)
-        else:
-            r = requests.request(method, url, headers=headers, params=params, json=body, timeout=30)
+        r = _SESSION.request(
+            method.upper(),
+            url,
+            headers=headers,
+            params=params,
+            json=body if method.upper() not in ("GET", "HEAD") else None,
+            timeout=30,
+        )
     except requests.RequestException as e:
         return {"ok": False, "error": str(e), "status_code": None, "body": None}
 
     try:
-        response_body = r.json()
+        response_body = orjson.loads(r.content)
     except Exception:
         response_body = r.text
 
@@ -113,3 +167,70 @@ def _call_impl(
         "body": response_body,
         "error": None if r.ok else str(response_body),
     }
+
+
+async def call_client_api_async(
+    tenant_id: str,
+    endpoint: str,
+    method: str = "GET",
+    params: Optional[dict] = None,
+    body: Optional[dict] = None,
+    integration_type: Optional[str] = None,
+    db: Optional[Session] = None,
+) -> dict[str, Any]:
+    """
+    Async variant of call_client_api, same contract. The HTTP round-trip
+    runs on the shared httpx.AsyncClient; the integration-config query
+    stays on the sync session via a worker thread.
+    """
+    if db is None:
+        from database import SessionLocal
+        db = SessionLocal()
+        try:
+            return await _acall_impl(db, tenant_id, endpoint, method, params, body, integration_type)
+        finally:
+            db.close()
+    return await _acall_impl(db, tenant_id, endpoint, method, params, body, integration_type)
+
+
+async def _acall_impl(
+    db: Session,
+    tenant_id: str,
+    endpoint: str,
+    method: str,
+    params: Optional[dict],
+    body: Optional[dict],
+    integration_type: Optional[str],
+) -> dict[str, Any]:
+    config = await asyncio.to_thread(_get_integration_config, db, tenant_id, integration_type)
+    if not config:
+        return {"ok": False, "error": "No integration configured", "status_code": None, "body": None}
+    base_url, api_key, auth_type = config
+
+    base = base_url.rstrip("/")
+    path = endpoint if endpoint.startswith("/") else f"/{endpoint}"
+    url = f"{base}{path}"
+    headers = _build_headers(api_key, auth_type)
+
+    try:
+        r = await _ASYNC_CLIENT.request(
+            method.upper(),
+            url,
+            headers=headers,
+            params=params,
+            json=body if method.upper() not in ("GET", "HEAD") else None,
+        )
+    except httpx.HTTPError as e:
+        return {"ok": False, "error": str(e), "status_code": None, "body": None}
+
+    try:
+        response_body = orjson.loads(r.content)
+    except Exception:
+        response_body = r.text
+
+    return {
+        "ok": 200 <= r.status_code < 300,
+        "status_code": r.status_code,
+        "body": response_body,
+        "error": None if r.is_success else str(response_body),
+    }
@@ -0,0 +1,149 @@
+"""
+Tenant-tier-aware vector store backends.
+
+Chroma degrades badly past a few hundred thousand vectors (pickle loads,
+RAM growth), so large tenants are served from a FAISS IVF+PQ index that
+is persisted with faiss.write_index and reopened memory-mapped — no
+unpickle cost and near-constant RAM regardless of index size.
+
+Backend selection is persistent per tenant: a tenant uses FAISS once
+migrate_tenant_to_faiss() has been run for it (an explicit admin action
+for tenants that outgrow Chroma); everyone else stays on Chroma.
+"""
+
+import functools
+import os
+import pickle
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from langchain_core.documents import Document
+
+from knowledge.search import _get_vector_store
+
+FAISS_DIR = os.getenv("FAISS_DIR", "./data/faiss")
+
+# IVF+PQ layout: 4096 cells, 64 sub-quantizers x 8 bits = 64 bytes/vector
+# (24x smaller than f32), int8 codes scanned with SIMD.
+_FAISS_NLIST = 4096
+_FAISS_PQ_M = 64
+_FAISS_PQ_BITS = 8
+_FAISS_DIM = 1536
+# Cells probed per query. FAISS defaults to 1 (near-useless recall at
+# nlist=4096); 32 keeps recall high while scanning <1% of the codes.
+_FAISS_NPROBE = int(os.getenv("FAISS_NPROBE", "32"))
+
+
+def _faiss_index_path(tenant_id: str) -> Path:
+    return Path(FAISS_DIR) / f"{tenant_id}.faiss"
+
+
+def _faiss_payload_path(tenant_id: str) -> Path:
+    return Path(FAISS_DIR) / f"{tenant_id}.docs.pkl"
+
+
+class ChromaBackend:
+    """Default backend: the tenant's Chroma collection."""
+
+    def __init__(self, tenant_id: str):
+        self.tenant_id = tenant_id
+
+    def search(self, vector: List[float], k: int = 5, filter: dict | None = None) -> List[Document]:
+        store = _get_vector_store(self.tenant_id)
+        return store.similarity_search_by_vector(vector, k=k, filter=filter)
+
+    async def asearch(self, vector: List[float], k: int = 5, filter: dict | None = None) -> List[Document]:
+        store = _get_vector_store(self.tenant_id)
+        return await store.asimilarity_search_by_vector(vector, k=k, filter=filter)
+
+
+class FaissBackend:
+    """
+    Large-tenant backend: mmap'd faiss.IndexIVFPQ plus a pickled payload
+    list (position -> (page_content, metadata)). Metadata filters are
+    applied post-search over an over-fetched candidate set.
+    """
+
+    def __init__(self, tenant_id: str):
+        import faiss
+
+        self.tenant_id = tenant_id
+        self._index = faiss.read_index(
+            str(_faiss_index_path(tenant_id)), faiss.IO_FLAG_MMAP
+        )
+        self._index.nprobe = _FAISS_NPROBE
+        with _faiss_payload_path(tenant_id).open("rb") as f:
+            self._payloads: list[tuple[str, dict]] = pickle.load(f)
+
+    def search(self, vector: List[float], k: int = 5, filter: dict | None = None) -> List[Document]:
+        fetch = k * 4 if filter else k
+        q = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        _, ids = self._index.search(q, fetch)
+        docs: List[Document] = []
+        for idx in ids[0]:
+            if idx < 0 or idx >= len(self._payloads):
+                continue
+            content, metadata = self._payloads[idx]
+            if filter and any(metadata.get(key) != value for key, value in filter.items()):
+                continue
+            docs.append(Document(page_content=content, metadata=metadata))
+            if len(docs) >= k:
+                break
+        return docs
+
+    async def asearch(self, vector: List[float], k: int = 5, filter: dict | None = None) -> List[Document]:
+        # FAISS search is in-process CPU work (~ms); no IO to await.
+        return self.search(vector, k=k, filter=filter)
+
+
+@functools.lru_cache(maxsize=256)
+def get_backend(tenant_id: str):
+    """Return the tenant's backend; FAISS if the tenant has been migrated."""
+    if _faiss_index_path(tenant_id).exists():
+        return FaissBackend(tenant_id)
+    return ChromaBackend(tenant_id)
+
+
+def refresh_if_migrated(tenant_id: str) -> None:
+    """
+    Re-export a migrated tenant's index after new chunks land in Chroma.
+    Ingest always writes to Chroma (the source of truth); without this,
+    post-migration uploads would be invisible to FAISS-served searches.
+    No-op for non-migrated tenants.
+    """
+    if _faiss_index_path(tenant_id).exists():
+        migrate_tenant_to_faiss(tenant_id)
+
+
+def migrate_tenant_to_faiss(tenant_id: str) -> int:
+    """
+    Export a tenant's Chroma collection into a trained IVF+PQ index.
+    Run for tenants that outgrow Chroma; subsequent get_backend calls
+    serve them from FAISS. Re-runnable: each run rebuilds the index and
+    payload sidecar from the full collection and drops cached backends.
+    Returns number of vectors migrated.
+    """
+    import faiss
+
+    collection = _get_vector_store(tenant_id)._collection
+    data = collection.get(include=["embeddings", "documents", "metadatas"])
+    vectors = np.asarray(data["embeddings"], dtype=np.float32)
+    if vectors.size == 0:
+        return 0
+    payloads = list(zip(data["documents"], data["metadatas"]))
+
+    # Normalize so inner product == cosine similarity.
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    nlist = min(_FAISS_NLIST, max(1, len(vectors) // 39))
+    quantizer = faiss.IndexFlatIP(_FAISS_DIM)
+    index = faiss.IndexIVFPQ(quantizer, _FAISS_DIM, nlist, _FAISS_PQ_M, _FAISS_PQ_BITS)
+    index.train(vectors)
+    index.add(vectors)
+
+    Path(FAISS_DIR).mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(_faiss_index_path(tenant_id)))
+    with _faiss_payload_path(tenant_id).open("wb") as f:
+        pickle.dump(payloads, f)
+    get_backend.cache_clear()
+    return len(vectors)
@@ -9,16 +9,20 @@ We use LangChain loaders + text splitter + OpenAIEmbeddings + Chroma.
 Only embeddings are stored; raw document text stays in files.
 """
 
+import asyncio
+import functools
+import hashlib
 import os
+from datetime import datetime
 from pathlib import Path
 from typing import List
 
-from langchain_community.document_loaders import PyPDFLoader, TextLoader, Docx2txtLoader
-from langchain_openai import OpenAIEmbeddings
-from langchain_chroma import Chroma
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_core.documents import Document
 
+# Loader, splitter, and Chroma imports are deferred into the functions
+# that use them; ingestion is rare relative to chat/auth traffic and the
+# imports are heavyweight (chromadb, pypdf, docx).
+
 # Root where vector DB is stored; structure:
 # {VECTOR_DB_ROOT}/tenant_1/, tenant_2/, ...
 VECTOR_DB_ROOT = os.getenv("CHROMA_PERSIST_DIR", "./data/vector_db")
@@ -29,9 +33,13 @@ def _get_loader(file_path: str):
     Choose appropriate loader based on file extension.
     Supported: .pdf, .txt, .md, .docx
     """
+    from langchain_community.document_loaders import PyMuPDFLoader, TextLoader, Docx2txtLoader
+
     suffix = Path(file_path).suffix.lower()
     if suffix == ".pdf":
-        return PyPDFLoader(file_path)
+        # PyMuPDF extracts text via the MuPDF C library — 5-10x faster
+        # than pure-Python pypdf on PDF-heavy tenants.
+        return PyMuPDFLoader(file_path)
     if suffix in (".txt", ".md"):
         return TextLoader(file_path, encoding="utf-8")
     if suffix == ".docx":
@@ -39,26 +47,60 @@ def _get_loader(file_path: str):
     raise ValueError(f"Unsupported file type for ingestion: {suffix}")
 
 
+class RustTextSplitter:
+    """
+    langchain-compatible wrapper around semantic_text_splitter's Rust
+    TextSplitter. RecursiveCharacterTextSplitter is pure Python and
+    rescans substrings per iteration, which dominates ingest CPU on
+    multi-MB documents; the Rust splitter caches counts and respects
+    UTF-8 boundaries without re-scanning.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        from semantic_text_splitter import TextSplitter
+
+        self._splitter = TextSplitter(capacity=chunk_size, overlap=chunk_overlap)
+
+    def split_text(self, text: str) -> List[str]:
+        return list(self._splitter.chunks(text))
+
+    def split_documents(self, docs: List[Document]) -> List[Document]:
+        return [
+            Document(page_content=chunk, metadata=dict(doc.metadata))
+            for doc in docs
+            for chunk in self._splitter.chunks(doc.page_content)
+        ]
+
+
+@functools.lru_cache(maxsize=1)
+def _get_splitter() -> RustTextSplitter:
+    return RustTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+
 def _split_documents(docs: List[Document]) -> List[Document]:
     """Split long documents into overlapping chunks."""
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
-        length_function=len,
-    )
-    return splitter.split_documents(docs)
+    return _get_splitter().split_documents(docs)
 
 
-def _get_vector_store(tenant_id: str) -> Chroma:
+@functools.lru_cache(maxsize=256)
+def _get_vector_store(tenant_id: str):
     """
-    Create or load a Chroma collection for this tenant.
+    Create or load a Chroma collection for this tenant, cached per tenant
+    so repeat ingests reuse the client and warm HNSW index.
     Collection name: tenant_{tenant_id}
     All collections share the same VECTOR_DB_ROOT directory.
     """
+    from langchain_chroma import Chroma
+    from langchain_openai import OpenAIEmbeddings
+
+    from http_clients import get_async_httpx_client, get_sync_httpx_client
+
     os.makedirs(VECTOR_DB_ROOT, exist_ok=True)
     embeddings = OpenAIEmbeddings(
         model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
         api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_sync_httpx_client(),
+        http_async_client=get_async_httpx_client(),
     )
     return Chroma(
         collection_name=f"tenant_{tenant_id}",
@@ -67,25 +109,276 @@ def _get_vector_store(tenant_id: str) -> Chroma:
     )
 
 
-def ingest_document(file_path: str, tenant_id: str) -> int:
+def _stamp_metadata(chunk: Document, file_path: str) -> dict:
     """
-    Ingest a single document file into the tenant's knowledge base.
+    Ensure every stored chunk carries the filterable keys search supports
+    (category, doc_type, ingested_at) plus its source path.
+    """
+    meta = dict(chunk.metadata or {})
+    meta.setdefault("source", file_path)
+    meta.setdefault("category", "general")
+    meta.setdefault("doc_type", Path(file_path).suffix.lstrip(".").lower() or "text")
+    meta.setdefault("ingested_at", datetime.utcnow().isoformat())
+    return meta
+
 
-    Steps:
-    1. Load document (PDF, text, docx)
-    2. Split into chunks
-    3. Embed and store in Chroma collection tenant_{tenant_id}
+def _chunk_id(chunk: Document) -> str:
+    """Stable content-derived id: re-ingesting a file upserts instead of
+    duplicating chunks."""
+    return hashlib.blake2b(chunk.page_content.encode(), digest_size=16).hexdigest()
+
+
+def _filter_new_chunks(collection, chunks: List[Document], seen: set[str]) -> List[Document]:
+    """
+    Drop chunks whose content hash is already in the collection (or already
+    queued in this ingest, via `seen`). Embedding is the dominant ingest
+    cost, and re-uploading an edited document leaves most chunks byte-
+    identical — those skip the OpenAI call entirely.
+    """
+    ids = []
+    candidates = []
+    for chunk in chunks:
+        cid = _chunk_id(chunk)
+        if cid in seen:
+            continue
+        seen.add(cid)
+        ids.append(cid)
+        candidates.append(chunk)
+    if not ids:
+        return []
+    existing = set(collection.get(ids=ids, include=[])["ids"])
+    return [c for cid, c in zip(ids, candidates) if cid not in existing]
+
+
+def ingest_texts(texts: List[str], tenant_id: str, source: str = "inline") -> int:
+    """
+    Ingest raw text snippets (no file on disk) into the tenant's knowledge
+    base — same split/dedupe/batched-embed treatment as file ingestion, so
+    the chunks land in the Chroma collection chat retrieval actually
+    searches. Writes go to the collection in explicit 250-chunk batches
+    (its client-side batching sweet spot) with content-hash ids; chunks
+    whose hash already exists skip re-embedding.
 
     Returns: number of chunks stored.
     """
-    loader = _get_loader(file_path)
-    docs = loader.load()
+    docs = [Document(page_content=text) for text in texts if text.strip()]
     if not docs:
         return 0
     chunks = _split_documents(docs)
     if not chunks:
         return 0
-    vector_store = _get_vector_store(tenant_id)
-    vector_store.add_documents(chunks)
-    return len(chunks)
+    store = _get_vector_store(tenant_id)
+    collection = store._collection
+    seen: set[str] = set()
+    stored = 0
+    for i in range(0, len(chunks), _WRITE_BATCH_CHUNKS):
+        batch = _filter_new_chunks(collection, chunks[i : i + _WRITE_BATCH_CHUNKS], seen)
+        if not batch:
+            continue
+        vectors = store.embeddings.embed_documents([c.page_content for c in batch])
+        collection.add(
+            ids=[_chunk_id(c) for c in batch],
+            embeddings=vectors,
+            documents=[c.page_content for c in batch],
+            metadatas=[_stamp_metadata(c, source) for c in batch],
+        )
+        stored += len(batch)
+    if stored:
+        _refresh_backend(tenant_id)
+    return stored
+
+
+def _refresh_backend(tenant_id: str) -> None:
+    """
+    Keep a FAISS-migrated tenant's index in sync: ingest writes to Chroma
+    (the source of truth), so after new chunks land the FAISS export is
+    rebuilt. No-op for tenants still served from Chroma.
+    """
+    from knowledge.backends import refresh_if_migrated
+
+    refresh_if_migrated(tenant_id)
+
+
+# Pipeline stage sizes: pages per load batch, chunks per embedding request,
+# embeddings per Chroma write (client-side batching sweet spot is 50-250).
+_LOAD_BATCH_PAGES = 16
+_EMBED_BATCH_CHUNKS = 256
+_WRITE_BATCH_CHUNKS = 250
+
+_STAGE_DONE = object()
+
+
+class BatchingEmbedder:
+    """
+    Coalesces embedding requests across concurrent ingests. Embedding
+    APIs bill and add latency per request, so texts queued within a
+    short window (or until a batch fills) ride one HTTP call instead of
+    one per document — many small concurrent uploads pack into full
+    batches. Callers await per-text futures resolved by the consumer.
+    """
+
+    MAX_BATCH = 96
+    MAX_WAIT_SECONDS = 0.02
+
+    def __init__(self):
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_consumer(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._task = loop.create_task(self._consume())
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        self._ensure_consumer()
+        futures = []
+        for text in texts:
+            future = self._loop.create_future()
+            futures.append(future)
+            await self._queue.put((text, future))
+        return [await f for f in futures]
+
+    async def _consume(self) -> None:
+        from knowledge.search import _get_embeddings
+
+        embeddings = _get_embeddings()
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                while len(batch) < self.MAX_BATCH:
+                    batch.append(
+                        await asyncio.wait_for(self._queue.get(), timeout=self.MAX_WAIT_SECONDS)
+                    )
+            except asyncio.TimeoutError:
+                pass
+            try:
+                vectors = await embeddings.aembed_documents([t for t, _ in batch])
+                for (_, future), vector in zip(batch, vectors):
+                    if not future.done():
+                        future.set_result(vector)
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+
+
+_batching_embedder = BatchingEmbedder()
+
+
+async def ingest_document_async(file_path: str, tenant_id: str) -> int:
+    """
+    Ingest a single document file (PDF, text, docx) into the tenant's
+    knowledge base. Loading, splitting, embedding, and vector-store writes
+    run as coroutines connected by bounded queues, so embedding network
+    latency overlaps the next batch's parsing and the writer batches
+    embeddings into large Chroma adds. Chunks whose content hash already
+    exists in the collection are skipped without re-embedding.
+
+    Returns: number of chunks stored.
+    """
+    doc_queue: asyncio.Queue = asyncio.Queue(maxsize=4)
+    chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * _EMBED_BATCH_CHUNKS)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=2 * _WRITE_BATCH_CHUNKS)
+
+    async def load_stage():
+        loader = _get_loader(file_path)
+        docs = await asyncio.to_thread(loader.load)
+        for i in range(0, len(docs), _LOAD_BATCH_PAGES):
+            await doc_queue.put(docs[i : i + _LOAD_BATCH_PAGES])
+        await doc_queue.put(_STAGE_DONE)
+
+    async def split_stage():
+        while True:
+            batch = await doc_queue.get()
+            if batch is _STAGE_DONE:
+                break
+            for chunk in await asyncio.to_thread(_split_documents, batch):
+                await chunk_queue.put(chunk)
+        await chunk_queue.put(_STAGE_DONE)
+
+    async def embed_stage():
+        store = _get_vector_store(tenant_id)
+        buffer: list[Document] = []
+        seen: set[str] = set()
+
+        async def flush():
+            new = await asyncio.to_thread(_filter_new_chunks, store._collection, list(buffer), seen)
+            buffer.clear()
+            if not new:
+                return
+            # Shared micro-batcher: concurrent ingests (ingest_directory,
+            # parallel uploads) coalesce into full embedding requests.
+            vectors = await _batching_embedder.embed([c.page_content for c in new])
+            for pair in zip(new, vectors):
+                await write_queue.put(pair)
+
+        while True:
+            chunk = await chunk_queue.get()
+            if chunk is _STAGE_DONE:
+                break
+            buffer.append(chunk)
+            if len(buffer) >= _EMBED_BATCH_CHUNKS:
+                await flush()
+        if buffer:
+            await flush()
+        await write_queue.put(_STAGE_DONE)
+
+    async def write_stage() -> int:
+        collection = _get_vector_store(tenant_id)._collection
+        buffer: list[tuple[Document, list[float]]] = []
+        total = 0
+
+        async def flush():
+            nonlocal total
+            await asyncio.to_thread(
+                collection.add,
+                ids=[_chunk_id(c) for c, _ in buffer],
+                embeddings=[vec for _, vec in buffer],
+                documents=[c.page_content for c, _ in buffer],
+                metadatas=[_stamp_metadata(c, file_path) for c, _ in buffer],
+            )
+            total += len(buffer)
+            buffer.clear()
+
+        while True:
+            item = await write_queue.get()
+            if item is _STAGE_DONE:
+                break
+            buffer.append(item)
+            if len(buffer) >= _WRITE_BATCH_CHUNKS:
+                await flush()
+        if buffer:
+            await flush()
+        return total
+
+    results = await asyncio.gather(load_stage(), split_stage(), embed_stage(), write_stage())
+    if results[3]:
+        await asyncio.to_thread(_refresh_backend, tenant_id)
+    return results[3]
+
+
+async def ingest_directory(tenant_id: str, paths: List[str], max_concurrency: int = 8) -> int:
+    """
+    Ingest many files for one tenant concurrently. Files embed
+    independently and embedding latency dominates, so a semaphore-bounded
+    gather turns a dozens-of-files onboarding from serial round-trips
+    into max_concurrency overlapping pipelines.
+
+    Returns: total number of chunks stored across all files.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def ingest_one(path: str) -> int:
+        async with semaphore:
+            try:
+                return await ingest_document_async(path, tenant_id)
+            except ValueError:
+                # Unsupported file type: skip rather than fail the batch.
+                return 0
+
+    counts = await asyncio.gather(*[ingest_one(p) for p in paths])
+    return sum(counts)
 
@@ -5,38 +5,104 @@ search_documents(query, tenant_id) returns top 5 relevant chunks
 from the tenant's Chroma collection.
 """
 
+import functools
 import os
 from typing import List
 
-from langchain_openai import OpenAIEmbeddings
-from langchain_chroma import Chroma
 from langchain_core.documents import Document
 
+# langchain_openai and langchain_chroma (-> chromadb) are imported lazily
+# inside the functions below: they cost ~200ms and tens of MB per worker,
+# and workers serving only auth/admin traffic never need them.
+
 VECTOR_DB_ROOT = os.getenv("CHROMA_PERSIST_DIR", "./data/vector_db")
 
 
-def _get_vector_store(tenant_id: str) -> Chroma:
-    """Load Chroma collection for this tenant."""
-    embeddings = OpenAIEmbeddings(
+@functools.lru_cache(maxsize=1)
+def _get_embeddings():
+    from langchain_openai import OpenAIEmbeddings
+
+    from http_clients import get_async_httpx_client, get_sync_httpx_client
+
+    return OpenAIEmbeddings(
         model=os.getenv("OPENAI_EMBEDDING_MODEL", "text-embedding-3-small"),
         api_key=os.getenv("OPENAI_API_KEY"),
+        http_client=get_sync_httpx_client(),
+        http_async_client=get_async_httpx_client(),
     )
+
+
+@functools.lru_cache(maxsize=256)
+def _get_vector_store(tenant_id: str):
+    """Load (and cache) the Chroma collection for this tenant, keeping its
+    in-process HNSW index warm across requests."""
+    from langchain_chroma import Chroma
+
     return Chroma(
         collection_name=f"tenant_{tenant_id}",
-        embedding_function=embeddings,
+        embedding_function=_get_embeddings(),
         persist_directory=VECTOR_DB_ROOT,
     )
 
 
-def search_documents(query: str, tenant_id: str, k: int = 5) -> List[Document]:
+@functools.lru_cache(maxsize=1024)
+def _embed_query_cached(query: str) -> tuple[float, ...]:
+    """
+    Memoized query embedding (tuple for hashability). Embeddings are a pure
+    function of the text — tenant-independent — so repeat FAQ-style queries
+    skip the 40-600ms embedding round-trip entirely.
+    """
+    return tuple(_get_embeddings().embed_query(query))
+
+
+def embed_query(query: str) -> List[float]:
+    """Embed a query once so callers can reuse the vector (cache + search)."""
+    return list(_embed_query_cached(query))
+
+
+async def aembed_query(query: str) -> List[float]:
+    """Async variant of embed_query, for overlapping with other I/O."""
+    return await _get_embeddings().aembed_query(query)
+
+
+def search_documents(query: str, tenant_id: str, k: int = 5, filter: dict | None = None) -> List[Document]:
     """
     Search the tenant's knowledge base for relevant chunks.
 
+    filter narrows the ANN search space by chunk metadata before
+    similarity ranking — e.g. {"category": "billing"} or
+    {"doc_type": "pdf"}. Ingest stamps "category", "doc_type", and
+    "ingested_at" on every chunk.
+
     Returns: list of LangChain Document objects (top-k).
     """
     try:
-        store = _get_vector_store(tenant_id)
-        return store.similarity_search(query, k=k)
+        from knowledge.backends import get_backend
+
+        return get_backend(tenant_id).search(embed_query(query), k=k, filter=filter)
+    except Exception:
+        return []
+
+
+def search_documents_by_vector(vector: List[float], tenant_id: str, k: int = 5, filter: dict | None = None) -> List[Document]:
+    """
+    Same as search_documents but takes a precomputed query embedding,
+    so the embedding API is not called twice per chat turn.
+    """
+    try:
+        from knowledge.backends import get_backend
+
+        return get_backend(tenant_id).search(vector, k=k, filter=filter)
+    except Exception:
+        return []
+
+
+async def asearch_documents_by_vector(vector: List[float], tenant_id: str, k: int = 5, filter: dict | None = None) -> List[Document]:
+    """Async variant of search_documents_by_vector."""
+    try:
+        from knowledge.backends import get_backend
+
+        return await get_backend(tenant_id).asearch(vector, k=k, filter=filter)
     except Exception:
         return []
 
@@ -9,7 +9,10 @@ from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
+import chat_logging
 from database import init_db
 from routes import auth, chat, upload, admin, webhook
 
@@ -18,12 +21,14 @@ load_dotenv()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create DB tables and Chroma dir on startup."""
+    """Create DB tables and Chroma dir on startup; run the log writer."""
     init_db()
     # Default vector DB path: ./data/vector_db (matches /data/vector_db in containers)
     persist_dir = os.getenv("CHROMA_PERSIST_DIR", "./data/vector_db")
     os.makedirs(persist_dir, exist_ok=True)
+    chat_logging.start()
     yield
+    await chat_logging.stop()
 
 
 app = FastAPI(
@@ -31,8 +36,28 @@ app = FastAPI(
     description="Multi-tenant Customer Support AI with RAG, JWT, API keys",
     version="2.0.0",
     lifespan=lifespan,
+    # orjson: SIMD-accelerated encode for the KB-heavy payloads we emit.
+    default_response_class=ORJSONResponse,
 )
 
+# SSE must bypass gzip: streamed responses carry no Content-Length, so
+# GZipMiddleware compresses them regardless of minimum_size, and zlib's
+# internal buffering holds tokens back until the stream ends.
+_GZIP_EXEMPT_PATHS = {"/chat"}
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in _GZIP_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Compress large JSON bodies (admin lists, KB search results); responses
+# under minimum_size skip compression so small chat turns pay nothing.
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=1024)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=[
@@ -7,18 +7,23 @@ We do NOT store client business data (orders, customers, invoices); that stays i
 """
 
 from datetime import datetime
-from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
+from uuid6 import uuid7
 
 from database import Base
 
 
 def generate_uuid():
-    """Generate UUID for primary keys."""
-    return str(uuid4())
+    """
+    Generate UUID for primary keys. uuid7 is time-ordered (48-bit ms
+    timestamp prefix), so B-tree inserts append to the hot right edge
+    instead of dirtying random pages the way uuid4 does — which matters
+    most for write-heavy chat_logs.
+    """
+    return str(uuid7())
 
 
 class Tenant(Base):
@@ -31,6 +36,9 @@ class Tenant(Base):
     id = Column(UUID(as_uuid=False), primary_key=True, default=generate_uuid)
     name = Column(String(255), nullable=False, index=True)
     api_key = Column(String(64), unique=True, nullable=False, index=True)
+    # sha256 hex digest of api_key; lookups go through this indexed column
+    # (constant-time wrt the secret, O(log N) via the B-tree).
+    api_key_sha256 = Column(String(64), unique=True, nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     users = relationship("User", back_populates="tenant")
@@ -64,6 +72,9 @@ class Integration(Base):
     We store only config (base_url, api_key, auth_type) — NOT client data.
     """
     __tablename__ = "integrations"
+    # get_tenant_integration filters on both columns; a composite index
+    # makes that lookup a single B-tree probe.
+    __table_args__ = (Index("ix_integrations_tenant_type", "tenant_id", "type"),)
 
     id = Column(UUID(as_uuid=False), primary_key=True, default=generate_uuid)
     tenant_id = Column(UUID(as_uuid=False), ForeignKey("tenants.id"), nullable=False)
@@ -89,6 +100,8 @@ class KnowledgeDocument(Base):
     id = Column(UUID(as_uuid=False), primary_key=True, default=generate_uuid)
     tenant_id = Column(UUID(as_uuid=False), ForeignKey("tenants.id"), nullable=False)
     file_path = Column(String(1024), nullable=False)  # reference only; content in Chroma
+    # Ingestion runs in the background: pending -> ready | failed.
+    status = Column(String(16), nullable=False, default="pending")
     created_at = Column(DateTime, default=datetime.utcnow)
 
     tenant = relationship("Tenant", back_populates="knowledge_documents")
@@ -100,9 +113,14 @@ class KnowledgeDocument(Base):
 class ChatLog(Base):
     """Chat history per tenant (message + AI response). No client business data."""
     __tablename__ = "chat_logs"
+    # Composite (tenant_id, timestamp): tenant-scoped timeline listings
+    # and the admin usage counts become index(-only) scans instead of
+    # heap scans as chat_logs grows.
+    __table_args__ = (Index("ix_chat_logs_tenant_time", "tenant_id", "timestamp"),)
 
     id = Column(UUID(as_uuid=False), primary_key=True, default=generate_uuid)
-    tenant_id = Column(UUID(as_uuid=False), ForeignKey("tenants.id"), nullable=False)
+    # Indexed: admin usage queries group/filter chat_logs by tenant.
+    tenant_id = Column(UUID(as_uuid=False), ForeignKey("tenants.id"), nullable=False, index=True)
     message = Column(Text, nullable=False)
     response = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
@@ -5,17 +5,20 @@ POST /auth/login - Return JWT
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import exists, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 import secrets
 
 from database import get_db
-from models import User, Company
+from models import User, Tenant
 from auth import (
+    create_access_token,
+    hash_api_key,
     hash_password,
+    password_needs_rehash,
     verify_password,
-    create_access_token,
-    get_user_by_id,
     CurrentUser,
 )
 
@@ -25,10 +28,15 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 # --- Request/Response schemas ---
 
 class SignupRequest(BaseModel):
-    """Signup: company name + first user email/password."""
-    company_name: str
+    """Signup: company name + first user email/password.
+
+    Length caps reject garbage before any bcrypt CPU is spent — without
+    them a multi-MB password string turns the hash into an amplification
+    target.
+    """
+    company_name: str = Field(min_length=1, max_length=128)
     email: EmailStr
-    password: str
+    password: str = Field(min_length=8, max_length=128)
 
 
 class SignupResponse(BaseModel):
@@ -43,7 +51,7 @@ class SignupResponse(BaseModel):
 
 class LoginRequest(BaseModel):
     email: EmailStr
-    password: str
+    password: str = Field(min_length=1, max_length=128)
 
 
 class LoginResponse(BaseModel):
@@ -65,46 +73,76 @@ def signup(data: SignupRequest, db: Session = Depends(get_db)):
     """
     Register a new company and first user.
     Returns JWT and company API key for dashboard and API access.
+
+    Deliberately a sync handler: bcrypt and the sync Session's blocking
+    IO (flush/commit WAL sync) both belong on Starlette's threadpool,
+    not the event loop.
     """
-    # Check email not already used
-    if db.query(User).filter(User.email == data.email).first():
+    # Check email not already used — EXISTS stops at the first index hit
+    # and doesn't materialize a row.
+    if db.scalar(select(exists().where(User.email == data.email))):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    # Create company with unique API key
-    api_key = generate_api_key()
-    company = Company(name=data.company_name.strip(), api_key=api_key)
-    db.add(company)
-    db.flush()  # get company.id
-
-    # Create user linked to company
-    user = User(
-        email=data.email,
-        password=hash_password(data.password),
-        company_id=company.id,
-    )
-    db.add(user)
-    db.flush()
-
-    db.commit()
-    db.refresh(company)
-    db.refresh(user)
-
-    access_token = create_access_token(data={"sub": user.id})
-    return SignupResponse(
-        user_id=user.id,
-        company_id=company.id,
-        company_name=company.name,
-        api_key=company.api_key,
-        access_token=access_token,
-    )
+    hashed_password = hash_password(data.password)
+
+    # Key uniqueness is enforced by the UNIQUE constraint, not a
+    # pre-SELECT: the hot path is a single INSERT, and the astronomically
+    # rare collision regenerates the key and retries.
+    for _ in range(3):
+        # The whole INSERT path sits in the try: the statements actually
+        # execute at flush(), so a unique-key violation surfaces there,
+        # not only at commit().
+        try:
+            # Create company (tenant) with unique API key
+            api_key = generate_api_key()
+            company = Tenant(
+                name=data.company_name.strip(),
+                api_key=api_key,
+                api_key_sha256=hash_api_key(api_key),
+            )
+            db.add(company)
+            db.flush()  # get company.id
+
+            # Create user linked to company
+            user = User(
+                email=data.email,
+                password=hashed_password,
+                tenant_id=company.id,
+            )
+            db.add(user)
+            db.flush()
+
+            # Capture response fields before commit (which expires
+            # instances); ids are client-generated, so no refresh
+            # round-trips are needed.
+            response = SignupResponse(
+                user_id=user.id,
+                company_id=company.id,
+                company_name=company.name,
+                api_key=company.api_key,
+                access_token=create_access_token(data={"sub": user.id}),
+            )
+            db.commit()
+            return response
+        except IntegrityError:
+            db.rollback()
+            # Could also be a concurrent signup racing the email check.
+            if db.scalar(select(exists().where(User.email == data.email))):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Email already registered",
+                )
+    raise HTTPException(status_code=500, detail="Could not create account")
 
 
 @router.post("/login", response_model=LoginResponse)
 def login(data: LoginRequest, db: Session = Depends(get_db)):
     """
     Login with email and password. Returns JWT and company info including API key.
+    Sync handler for the same reason as signup: bcrypt + sync Session IO
+    run on the threadpool instead of the event loop.
     """
     user = db.query(User).filter(User.email == data.email).first()
     if not user or not verify_password(data.password, user.password):
@@ -112,7 +150,12 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
-    company = user.company
+    if password_needs_rehash(user.password):
+        # Transparent upgrade when the stored hash predates the current
+        # bcrypt cost; the only time we hold the plaintext is right here.
+        user.password = hash_password(data.password)
+        db.commit()
+    company = user.tenant
     access_token = create_access_token(data={"sub": user.id})
     return LoginResponse(
         access_token=access_token,
@@ -138,7 +181,7 @@ def me(user: CurrentUser):
     return MeResponse(
         user_id=user.id,
         email=user.email,
-        company_id=user.company_id,
-        company_name=user.company.name,
-        api_key=user.company.api_key,
+        company_id=user.tenant_id,
+        company_name=user.tenant.name,
+        api_key=user.tenant.api_key,
     )
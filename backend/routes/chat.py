@@ -10,28 +10,44 @@ Security:
 - Tenant API key via X-API-Key header (or JWT for dashboard users).
 """
 
+import io
+
 from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel
-from sse_starlette.sse import EventSourceResponse
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
+import chat_logging
 from auth import TenantFromAuth
 from database import get_db
-from models import ChatLog
+from routing import ORJSONRoute
 from agent import chat_stream as agent_chat_stream, chat as agent_chat
 
-router = APIRouter(tags=["chat"])
+router = APIRouter(tags=["chat"], route_class=ORJSONRoute)
 
 
 class ChatRequest(BaseModel):
-    tenant_id: str
-    message: str
+    # Bounds enforced in pydantic-core (Rust) before the handler runs:
+    # oversized messages never reach embedding or the LLM.
+    tenant_id: str = Field(max_length=64)
+    message: str = Field(max_length=8000)
 
 
 class ChatResponse(BaseModel):
     response: str
 
 
+def _sse_frame(text: str) -> bytes:
+    """
+    Encode one SSE event, emitting one `data:` line per newline in the
+    payload. Chunks regularly span lines (agent.chat_stream coalesces
+    ~50ms of deltas per chunk), and a bare f"data: {text}\\n\\n" would
+    put the continuation lines outside the SSE framing, where clients
+    silently drop them.
+    """
+    return ("".join(f"data: {line}\n" for line in text.split("\n")) + "\n").encode()
+
+
 @router.post("/chat")
 async def chat_stream_endpoint(
     request: ChatRequest,
@@ -48,24 +64,30 @@ async def chat_stream_endpoint(
         raise HTTPException(status_code=403, detail="tenant_id does not match credentials")
 
     async def event_generator():
-        full_response: list[str] = []
+        # Pre-encoded SSE frames: EventSourceResponse runs each event
+        # through its formatting layer per chunk; yielding bytes skips
+        # that entirely on the hottest path we have. The full reply is
+        # accumulated in one StringIO buffer rather than a list + join.
+        buf = io.StringIO()
         try:
             async for chunk in agent_chat_stream(request.tenant_id, request.message, db=db):
                 if chunk:
-                    full_response.append(chunk)
-                    yield {"data": chunk}
-            full = "".join(full_response)
-            log = ChatLog(
-                tenant_id=request.tenant_id,
-                message=request.message,
-                response=full,
-            )
-            db.add(log)
-            db.commit()
+                    buf.write(chunk)
+                    yield _sse_frame(chunk)
+            # Batched background insert — no per-stream commit/WAL sync.
+            await chat_logging.enqueue(request.tenant_id, request.message, buf.getvalue())
         except Exception as e:
-            yield {"data": f"[Error: {str(e)}]"}
+            yield _sse_frame(f"[Error: {str(e)}]")
 
-    return EventSourceResponse(event_generator())
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Tell nginx-style proxies not to buffer the stream.
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @router.post("/chat/completion", response_model=ChatResponse)
@@ -84,13 +106,7 @@ def chat_completion_endpoint(
         raise HTTPException(status_code=403, detail="tenant_id does not match credentials")
     try:
         response = agent_chat(request.tenant_id, request.message, db=db)
-        log = ChatLog(
-            tenant_id=request.tenant_id,
-            message=request.message,
-            response=response,
-        )
-        db.add(log)
-        db.commit()
+        chat_logging.enqueue_nowait(request.tenant_id, request.message, response)
         return ChatResponse(response=response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
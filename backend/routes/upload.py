@@ -7,26 +7,76 @@ Input (multipart/form-data):
 
 Flow:
 1. Save file under DATA_DIR/{tenant_id}/documents/
-2. Call ingest_document(file_path, tenant_id) to store embeddings in Chroma (tenant_{tenant_id})
+2. Call ingest_document_async(file_path, tenant_id) to store embeddings in Chroma (tenant_{tenant_id})
 3. Record KnowledgeDocument metadata (file_path) — no raw business data in DB
 """
 
+import functools
 import os
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, UploadFile, File, Form
 from sqlalchemy.orm import Session
 
 from auth import TenantFromAuth
 from database import get_db
 from models import KnowledgeDocument
-from knowledge.ingest import ingest_document
+from knowledge.ingest import ingest_document_async
 
 router = APIRouter(tags=["upload"])
 
+# Reject bad uploads before buffering anything: a Content-Length over the
+# cap is a 413 without reading the body, and unsupported extensions fail
+# before any disk or embedding work.
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+ALLOWED_SUFFIXES = {".pdf", ".txt", ".md", ".docx"}
 
-@router.post("/upload")
+# Per-tenant document dirs are created on first upload and remembered,
+# so steady-state uploads skip the stat/mkdir syscalls.
+_created_dirs: set[str] = set()
+
+
+@functools.lru_cache(maxsize=1)
+def _data_root() -> Path:
+    # Resolved on first request, not at import: main.py runs load_dotenv()
+    # after importing the routes, so an import-time getenv would miss a
+    # DATA_DIR that only exists in .env.
+    return Path(os.getenv("DATA_DIR", "./data"))
+
+
+def _tenant_docs_dir(tenant_id: str) -> Path:
+    docs_dir = _data_root() / tenant_id / "documents"
+    if tenant_id not in _created_dirs:
+        docs_dir.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(tenant_id)
+    return docs_dir
+
+
+async def _ingest_and_mark(file_path: str, tenant_id: str, document_id: str) -> None:
+    """
+    Background task: ingest the saved file, then flip the row's status.
+    A coroutine so it runs the pipelined ingest on the event loop — which
+    also lets BatchingEmbedder coalesce embedding calls across concurrent
+    uploads instead of each upload paying its own HTTP round-trips.
+    """
+    from database import AsyncSessionLocal
+
+    try:
+        await ingest_document_async(file_path, tenant_id)
+        doc_status = "ready"
+    except Exception:
+        doc_status = "failed"
+    async with AsyncSessionLocal() as db:
+        doc = await db.get(KnowledgeDocument, document_id)
+        if doc:
+            doc.status = doc_status
+            await db.commit()
+
+
+@router.post("/upload", status_code=202)
 async def upload_document(
+    request: Request,
+    background_tasks: BackgroundTasks,
     tenant_id: str = Form(...),
     file: UploadFile = File(...),
     tenant: TenantFromAuth = Depends(),
@@ -45,40 +95,60 @@ async def upload_document(
     if not file.filename:
         raise HTTPException(status_code=400, detail="File name is required")
 
+    content_length = request.headers.get("content-length")
+    if content_length and int(content_length) > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large (max {MAX_UPLOAD_BYTES} bytes)",
+        )
+    suffix = Path(file.filename).suffix.lower()
+    if suffix not in ALLOWED_SUFFIXES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type: {suffix or 'unknown'}",
+        )
+
     # Save file under DATA_DIR/{tenant_id}/documents/
-    data_root = os.getenv("DATA_DIR", "./data")
-    docs_dir = Path(data_root) / tenant_id / "documents"
-    docs_dir.mkdir(parents=True, exist_ok=True)
+    docs_dir = _tenant_docs_dir(tenant_id)
 
     safe_name = Path(file.filename).name  # avoid directory traversal
     dest_path = docs_dir / safe_name
 
-    content = await file.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="File is empty")
-
+    # Stream to disk in fixed-size chunks: peak memory stays O(1MB)
+    # instead of O(file), and the event loop isn't held for the copy.
+    # The byte count is enforced while streaming too, in case the
+    # Content-Length header lied.
+    written = 0
     with dest_path.open("wb") as f:
-        f.write(content)
+        while chunk := await file.read(1024 * 1024):
+            written += len(chunk)
+            if written > MAX_UPLOAD_BYTES:
+                break
+            f.write(chunk)
+    if written > MAX_UPLOAD_BYTES:
+        dest_path.unlink(missing_ok=True)
+        raise HTTPException(
+            status_code=413,
+            detail=f"File too large (max {MAX_UPLOAD_BYTES} bytes)",
+        )
+    if dest_path.stat().st_size == 0:
+        dest_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=400, detail="File is empty")
 
-    # Ingest into Chroma (per-tenant collection)
-    try:
-        chunks_added = ingest_document(str(dest_path), tenant_id)
-    except ValueError as e:
-        # Unsupported file type or loader error
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ingestion failed: {e}")
-
-    # Record metadata only (file_path), not raw content
+    # Record metadata only (file_path), not raw content. Ingestion
+    # (chunking + embedding, seconds of wall time) happens after the
+    # response is sent; the row's status tracks pending -> ready/failed.
     doc = KnowledgeDocument(tenant_id=tenant_id, file_path=str(dest_path))
     db.add(doc)
+    db.flush()
+    document_id = doc.id
     db.commit()
-    db.refresh(doc)
+
+    background_tasks.add_task(_ingest_and_mark, str(dest_path), tenant_id, document_id)
 
     return {
-        "status": "ok",
+        "status": "pending",
         "tenant_id": tenant_id,
         "file_path": str(dest_path),
-        "chunks_added": chunks_added,
-        "document_id": doc.id,
+        "document_id": document_id,
     }
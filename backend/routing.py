@@ -0,0 +1,31 @@
+"""
+Shared APIRoute subclass that parses request bodies with orjson.
+
+FastAPI reads JSON bodies through Request.json(), which uses stdlib
+json. For large inbound payloads (document ingest, batched texts) orjson
+parses at C speed with fewer allocations; pydantic validation then runs
+over the already-parsed dict as usual.
+"""
+
+from typing import Callable
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    async def json(self) -> dict:
+        if not hasattr(self, "_json"):
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            return await original_handler(ORJSONRequest(request.scope, request.receive))
+
+        return handler
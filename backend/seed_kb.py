@@ -0,0 +1,46 @@
+"""
+Seed a tenant's knowledge base with sample documents (dev/demo helper).
+
+Usage:
+    python seed_kb.py <tenant_id>
+
+All sample docs go through one ingest_texts call, which splits them,
+skips already-ingested chunks, and embeds in large batches — one or two
+HTTP calls total instead of one per document. Seeding uses the same
+Chroma collection (tenant_{tenant_id}) that chat retrieval searches.
+"""
+
+import sys
+
+from knowledge.ingest import ingest_texts
+
+SAMPLE_DOCUMENTS = [
+    "Shipping policy: standard delivery takes 3-5 business days. "
+    "Express delivery (1-2 business days) is available at checkout for an extra fee. "
+    "Orders placed before 2pm ship the same day.",
+    "Returns: items can be returned within 30 days of delivery in original "
+    "packaging. Refunds are issued to the original payment method within 5-7 "
+    "business days of us receiving the return.",
+    "Order tracking: once your order ships you receive a tracking link by "
+    "email. You can also ask this assistant 'where is my order <number>?' "
+    "for a live status.",
+    "Payments: we accept all major credit cards, PayPal, and bank transfer "
+    "for business accounts. Invoices are emailed automatically after every "
+    "purchase.",
+    "Support hours: our human support team is available Monday-Friday, "
+    "9:00-18:00 CET. Outside those hours this AI assistant answers from the "
+    "knowledge base and escalates by email when needed.",
+]
+
+
+def main() -> None:
+    if len(sys.argv) != 2:
+        print("Usage: python seed_kb.py <tenant_id>")
+        sys.exit(1)
+    tenant_id = sys.argv[1]
+    chunks = ingest_texts(SAMPLE_DOCUMENTS, tenant_id, source="seed_kb")
+    print(f"Seeded tenant {tenant_id}: {chunks} chunks stored")
+
+
+if __name__ == "__main__":
+    main()
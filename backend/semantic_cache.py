@@ -0,0 +1,100 @@
+"""
+Semantic response cache — per-tenant, in-process.
+
+Near-duplicate customer questions ("where is my order?", "order status")
+should not each pay for retrieval plus a GPT-4o round-trip. We embed the
+incoming message once, look it up here, and return the cached response when
+cosine similarity to a previous question is >= SEMANTIC_CACHE_THRESHOLD.
+
+Vectors are L2-normalized on insert, so similarity is a plain dot product.
+Entries are bucketed by random-projection LSH (sign of P @ q) so lookup
+stays sub-linear as a tenant's cache grows: we only scan the bucket the
+query hashes into.
+"""
+
+import os
+import threading
+
+import numpy as np
+
+EMBEDDING_DIM = 1536  # text-embedding-3-small
+SIMILARITY_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+LSH_BITS = int(os.getenv("SEMANTIC_CACHE_LSH_BITS", "8"))
+# Per-bucket entry cap; oldest entries are evicted first, which doubles
+# as a crude freshness bound for long-lived processes.
+BUCKET_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_BUCKET_MAX", "128"))
+
+
+def _normalize(vector: list[float] | np.ndarray) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+class SemanticCache:
+    """
+    Tenant-scoped cache of (query embedding, response) pairs.
+
+    Per tenant, per LSH bucket we keep a (N, dim) float32 matrix of
+    normalized query vectors and a parallel list of responses, so a lookup
+    is one BLAS matrix-vector product + argmax.
+    """
+
+    def __init__(
+        self,
+        dim: int = EMBEDDING_DIM,
+        bits: int = LSH_BITS,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = BUCKET_MAX_ENTRIES,
+    ):
+        self.dim = dim
+        self.threshold = threshold
+        self.max_entries = max_entries
+        # Fixed seed: the projection must be identical for insert and lookup
+        # across the process lifetime.
+        self._projection = (
+            np.random.default_rng(seed=0).standard_normal((bits, dim)).astype(np.float32)
+        )
+        # tenant_id -> bucket key -> (vectors matrix, responses)
+        self._buckets: dict[str, dict[tuple, tuple[np.ndarray, list[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def _bucket_key(self, vector: np.ndarray) -> tuple:
+        return tuple((self._projection @ vector > 0).tolist())
+
+    def get(self, tenant_id: str, vector: list[float] | np.ndarray) -> str | None:
+        """Return a cached response for a near-duplicate query, or None."""
+        q = _normalize(vector)
+        with self._lock:
+            bucket = self._buckets.get(tenant_id, {}).get(self._bucket_key(q))
+            if bucket is None:
+                return None
+            vectors, responses = bucket
+            sims = vectors @ q
+            best = int(np.argmax(sims))
+            if sims[best] >= self.threshold:
+                return responses[best]
+            return None
+
+    def put(self, tenant_id: str, vector: list[float] | np.ndarray, response: str) -> None:
+        """Cache a response under the query's embedding."""
+        q = _normalize(vector)
+        key = self._bucket_key(q)
+        with self._lock:
+            tenant_buckets = self._buckets.setdefault(tenant_id, {})
+            bucket = tenant_buckets.get(key)
+            if bucket is None:
+                vectors, responses = q.reshape(1, -1), [response]
+            else:
+                vectors, responses = bucket
+                vectors = np.vstack([vectors, q])
+                responses = responses + [response]
+            if len(responses) > self.max_entries:
+                # FIFO eviction keeps buckets (and the scan matvec) bounded.
+                vectors = np.ascontiguousarray(vectors[-self.max_entries:])
+                responses = responses[-self.max_entries:]
+            tenant_buckets[key] = (vectors, responses)
+
+
+# Shared instance for the process (one cache across all chat turns).
+semantic_cache = SemanticCache()